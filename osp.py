@@ -1,9 +1,5 @@
 # Off-Side Parser
 
-import re
-
-LWS = re.compile(r'[ \t]*')
-
 DEDENT = object()
 INDENT = object()
 
@@ -11,21 +7,22 @@ def tokenize(lines, tabs=4):
     lev_stack = [0]
     only_tabbed = True
     for line in lines:
-        mt = LWS.match(line)
-        span = mt.group(0)
-        if not span:
-            lev = 0
-        else:
-            if ' ' in span:
-                only_tabbed = False
-            t = tabs
-            if only_tabbed:
-                t = 1
-            lev = span.count(' ')
-            if '\t' in span:
-                if t is None:
-                    raise ValueError(f'cannot calculate length of span {span!r}')
-                lev += span.count('\t') * t
+        tail = line.lstrip(' \t')
+        span = line[:len(line) - len(tail)]
+        nspaces = ntabs = 0
+        for c in span:
+            if c == ' ':
+                nspaces += 1
+            elif c == '\t':
+                ntabs += 1
+        if nspaces:
+            only_tabbed = False
+        lev = nspaces
+        if ntabs:
+            t = 1 if only_tabbed else tabs
+            if t is None:
+                raise ValueError(f'cannot calculate length of span {span!r}')
+            lev += ntabs * t
 
         if lev > lev_stack[-1]:
             lev_stack.append(lev)
@@ -37,7 +34,7 @@ def tokenize(lines, tabs=4):
             if lev_stack[-1] < lev:
                 raise ValueError(f'level {lev} corresponds to no outer indent level (nearest {lev_stack})')
 
-        yield line[mt.span()[1]:].strip()
+        yield tail.strip()
 
     while len(lev_stack) > 1:
         lev_stack.pop()
@@ -68,4 +65,3 @@ if __name__ == '__main__':
             print(f'{olev * "  "}DEDENT')
         else:
             print(f'{olev * "  "}{op!r}')
-
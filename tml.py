@@ -1,5 +1,4 @@
-import io, sys, math
-from xml.etree import ElementTree as ET
+import sys, math, html
 
 import osp
 
@@ -59,8 +58,7 @@ DOC_TEMPLATE_FOOT = b'''
     </body>
 </html>'''
 
-DEFS = ET.XML('''
-<defs>
+DEFS_BYTES = b'''<defs>
     <pattern id="gs_hatch" width="50" height="50" patternTransform="rotate(45)" patternUnits="userSpaceOnUse">
         <rect x="0" y="0" width="50" height="50" style="stroke: none; fill: #070;"/>
         <rect x="0" y="0" width="30" height="50" style="stroke: none; fill: #aaa;"/>
@@ -76,7 +74,32 @@ DEFS = ET.XML('''
         <rect x="30" y="0" width="10" height="50" style="stroke: none; fill: #fff;"/>
         <rect x="40" y="0" width="10" height="50" style="stroke: none; fill: #007;"/>
     </pattern>
-</defs>''')
+</defs>'''
+
+# Times are usually whole years; keeping them as ints makes the later comparisons cheaper
+def parse_number(s):
+    try:
+        return int(s)
+    except ValueError:
+        return float(s)
+
+def split_directive(t):
+    parts = t.split(None, 1)
+    if len(parts) < 2:
+        return parts[0], ''
+    return parts[0], parts[1]
+
+SYM_GROUP, SYM_RANGE, SYM_EVENT = range(3)
+
+# Many ranges and events share the same class combination; share one frozenset and escaped class bytes among them
+CLASS_POOL = {}
+
+def pool_classes(classes):
+    key = frozenset(classes)
+    entry = CLASS_POOL.get(key)
+    if entry is None:
+        entry = CLASS_POOL[key] = (key, html.escape(' '.join(sorted(key))).encode('utf-8'))
+    return entry
 
 class Timeline(object):
     def __init__(self):
@@ -84,12 +107,20 @@ class Timeline(object):
         self.events = []
         self.constraints = set()
         self.groups = {}
+        self.bounds = None
+        self.range_list = None
+        self.symbols = None
+        self.selections = {}
 
     def add(self, obj):
+        self.bounds = None
+        self.symbols = None
+        self.selections = {}
         if isinstance(obj, Range):
             if obj.name in self.ranges:
                 print(f'Warning: range {obj.name} overwrites a previous entry', file=sys.stderr)
             self.ranges[obj.name] = obj
+            self.range_list = None
         elif isinstance(obj, Event):
             self.events.append(obj)
         elif isinstance(obj, Constraint):
@@ -121,30 +152,31 @@ class Timeline(object):
             else:
                 if not t:
                     continue
-                parts = t.split()
-                if parts[0] == 'comment':
+                kind, rest = split_directive(t)
+                if kind == 'comment':
                     osp.read_block(tok)
                     continue
-                handler = handlers.get(parts[0])
+                handler = handlers.get(kind)
                 if not handler:
-                    print(f'Warning: unknown block kind {parts[0]}, skipping', file=sys.stderr)
+                    print(f'Warning: unknown block kind {kind}, skipping', file=sys.stderr)
                     osp.read_block(tok)
                     continue
                 if next(tok) is not osp.INDENT:
-                    print(f'Warning: block for {parts[0]} didn\'t start, parser may desynchronize', file=sys.stderr)
+                    print(f'Warning: block for {kind} didn\'t start, parser may desynchronize', file=sys.stderr)
                     continue
-                result = handler.from_tokens(tok, parts)
+                result = handler.from_tokens(tok, ' '.join(rest.split()))
                 inst.add(result)
         return inst
 
     def link(self):
-        for idx, rg in enumerate(self.ranges.values()):
+        for idx, rg in enumerate(self.ordered_ranges()):
             rg.link(self)
             rg.idx = idx
-        ol = len(self.events)
-        self.events = sorted([ev for ev in self.events if ev.is_valid()], key = lambda ev: ev.time)
-        if len(self.events) != ol:
+        if not all(ev.is_valid() for ev in self.events):
+            ol = len(self.events)
+            self.events = [ev for ev in self.events if ev.is_valid()]
             print(f'Warning: culled {ol - len(self.events)} events for invalidity', file=sys.stderr)
+        self.events.sort(key = lambda ev: ev.time)
         for ev in self.events:
             ev.link(self)
         idx = 0
@@ -153,15 +185,29 @@ class Timeline(object):
                 ev.idx = idx
                 idx += 1
         self.universal_evs = idx
-        for rg in self.ranges.values():
+        self.build_symbols()
+        self.selections = {}
+        for rg in self.ordered_ranges():
             if hasattr(rg, 'parents') and rg.parents is not None:
                 for par in rg.parents:
                     self.constraints.add(Constraint(f'{rg.name}_born_after_{par.name}', [par.name], [rg.name]))
                     self.constraints.add(Constraint(f'{rg.name}_born_predeath_{par.name}', [rg.name], [par.name, -1, 'end']))
 
+    def build_symbols(self):
+        # Filled lowest precedence first, so groups shadow ranges shadow events; events are
+        # reversed so that the earliest wins when several share a name
+        self.symbols = {ev.name: (SYM_EVENT, ev) for ev in reversed(self.events) if ev.name is not None}
+        self.symbols.update((rg.name, (SYM_RANGE, rg)) for rg in self.ranges.values())
+        self.symbols.update((grp.name, (SYM_GROUP, grp)) for grp in self.groups.values())
+
+    def ordered_ranges(self):
+        if self.range_list is None:
+            self.range_list = list(self.ranges.values())
+        return self.range_list
+
     def layout(self):
         self.current_y = 0
-        for rg in self.ranges.values():
+        for rg in self.ordered_ranges():
             rg.layout(self)
         for ev in reversed(self.events):
             if ev.is_universal():
@@ -170,7 +216,7 @@ class Timeline(object):
 
     def dump(self):
         print('Timeline:', file=sys.stderr)
-        for rg in self.ranges.values():
+        for rg in self.ordered_ranges():
             rg.dump()
         for ev in self.events:
             ev.dump()
@@ -190,35 +236,43 @@ class Timeline(object):
             print('All valid constraints passed.', file=sys.stderr)
 
     def time_bounds(self):
-        tms = set()
+        if self.bounds is not None:
+            return self.bounds
+        mnt, mxt = math.inf, -math.inf
         for rg in self.ranges.values():
             for sp in rg.spans:
-                tms.add(sp.start)
-                tms.add(sp.end)
+                if sp.start < mnt:
+                    mnt = sp.start
+                if sp.end > mxt:
+                    mxt = sp.end
         for ev in self.events:
-            tms.add(ev.time)
-        return min(tms), max(tms)
+            if ev.time < mnt:
+                mnt = ev.time
+            if ev.time > mxt:
+                mxt = ev.time
+        self.bounds = mnt, mxt
+        return self.bounds
 
     def render(self, xmul = 10, ts = 10, ym = 50):
         mnt, mxt = self.time_bounds()
         mxt += ym
         height = self.height
-        svg = ET.Element('svg', xmlns = SVGNS, style = f'width: {(mxt - mnt) * xmul}px; height: {height}px;', viewBox = f'{mnt * xmul} 0 {(mxt - mnt) * xmul} {height}')
-        svg.append(DEFS)
+        out = sys.stdout.buffer
+        out.write(DOC_TEMPLATE_HEAD)
+        out.write(f'<svg xmlns="{SVGNS}" style="width: {(mxt - mnt) * xmul}px; height: {height}px;" viewBox="{mnt * xmul} 0 {(mxt - mnt) * xmul} {height}">'.encode('utf-8'))
+        out.write(DEFS_BYTES)
+        parts = []
+        append = parts.append
         for t in range(math.floor(mnt), math.ceil(mxt) + 1, ts):
-            ln = ET.SubElement(svg, 'line', x1 = str(xmul * t), x2 = str(xmul * t), y1 = '0', y2 = str(height))
-            ln.set('class', 'time')
-            lb = ET.SubElement(svg, 'text', x = str(xmul * t), y = str(height))
-            lb.text = str(t)
-            lb.set('class', 'time')
-        for rg in self.ranges.values():
-            rg.render(svg, xmul, self)
+            xt = xmul * t
+            append(b'<line class="time" x1="%a" x2="%a" y1="0" y2="%a"/><text class="time" x="%a" y="%a">%d</text>' % (xt, xt, height, xt, height, t))
+        out.write(b''.join(parts))
+        for rg in self.ordered_ranges():
+            rg.render(out, xmul, self)
         for ev in self.events:
-            ev.render(svg, xmul, self)
-        buf = io.BytesIO()
-        tree = ET.ElementTree(svg)
-        tree.write(buf, 'utf8', False)
-        sys.stdout.buffer.write(DOC_TEMPLATE_HEAD + buf.getvalue() + DOC_TEMPLATE_FOOT)
+            ev.render(out, xmul, self)
+        out.write(b'</svg>')
+        out.write(DOC_TEMPLATE_FOOT)
 
 
 class Range(object):
@@ -226,6 +280,7 @@ class Range(object):
         self.name = name
         self.dispname = dispname
         self.classes = set() if classes is None else classes
+        self.class_bytes = None
         self.spans = []
         self.idx = None
         self.ambient = False
@@ -236,48 +291,47 @@ class Range(object):
 
     @classmethod
     def from_tokens(cls, tok, hdr):
-        nm = ' '.join(hdr[1:])
-        inst = cls(nm)
+        inst = cls(hdr)
         cur_span = None
         for t in tok:
             if t is osp.INDENT:
                 print('Warning: unexpected range indent', file=sys.stderr)
             elif t is osp.DEDENT:
                 inst.spans.sort(key=lambda sp: sp.start)
+                inst.classes, inst.class_bytes = pool_classes(inst.classes)
                 return inst
             else:
                 if not t:
                     continue
-                parts = t.split()
-                cmd = parts[0]
+                cmd, rest = split_directive(t)
                 if cmd in cls.BEGIN_WORDS:
                     if cur_span is not None:
                         print(f'Warning: range {inst.name} overwriting previous beginning of range span {cur_span.sword} {cur_span.start}', file=sys.stderr)
-                    cur_span = Span(float(parts[1]), parts[0], None, None)
+                    cur_span = Span(parse_number(rest.split(None, 1)[0]), cmd, None, None)
                 elif cmd in cls.END_WORDS:
                     if cur_span is None:
-                        print(f'Warning: no previous span for directive {parts}', file=sys.stderr)
+                        print(f'Warning: no previous span for directive {t!r}', file=sys.stderr)
                     else:
-                        cur_span.eword = parts[0]
-                        cur_span.end = float(parts[1])
+                        cur_span.eword = cmd
+                        cur_span.end = parse_number(rest.split(None, 1)[0])
                         inst.spans.append(cur_span)
                         cur_span = None
                 elif cmd == 'class':
-                    for p in parts[1:]:
-                        inst.classes.add(p)
+                    inst.classes.update(rest.split())
                 elif cmd == 'name':
-                    inst.dispname = ' '.join(parts[1:])
+                    inst.dispname = ' '.join(rest.split())
                 elif cmd == 'ambient':
                     inst.ambient = True
                 else:
-                    cls.unhandled_directive(inst, parts)
+                    cls.unhandled_directive(inst, cmd, rest)
         print('Warning: interpreting EOF as ending block', file=sys.stderr)
         inst.spans.sort(key=lambda sp: sp.start)
+        inst.classes, inst.class_bytes = pool_classes(inst.classes)
         return inst
 
     @classmethod
-    def unhandled_directive(cls, inst, parts):
-        print(f'Warning: unhandled directive for class {cls}: {parts}', file=sys.stderr)
+    def unhandled_directive(cls, inst, cmd, rest):
+        print(f'Warning: unhandled directive for class {cls}: {cmd} {rest}', file=sys.stderr)
 
     def link(self, tml):
         if self.ambient:
@@ -303,13 +357,14 @@ class Range(object):
     def additional_repr(self):
         return ''
 
-    def render(self, svg, xmul, tml):
+    def render(self, out, xmul, tml):
+        if self.class_bytes is None:
+            self.classes, self.class_bytes = pool_classes(self.classes)
+        y = self.y
+        suffix = b' ' + self.class_bytes if self.class_bytes else b''
+        label = html.escape(self.dispname or '').encode('utf-8')
         for sp in self.spans:
-            rect = sp.render(svg, self.y, xmul)
-            rect.set('class', rect.get('class') +' ' + ' '.join(self.classes))
-            lb = ET.SubElement(svg, 'text', x = rect.get('x'), y = str(float(rect.get('y')) + float(rect.get('height')) / 2.0))
-            lb.set('class', rect.get('class'))
-            lb.text = self.dispname
+            sp.render(out, y, xmul, suffix, label)
 
 
 class Span(object):
@@ -328,10 +383,14 @@ class Span(object):
     HEIGHT = 50
     GAP = 20
 
-    def render(self, svg, y, xmul):
-        rect = ET.SubElement(svg, 'rect', x = str(self.start * xmul), y = str(y), width = str((self.end - self.start) * xmul), height = str(self.HEIGHT))
-        rect.set('class', f'start_{self.sword} end_{self.eword}')
-        return rect
+    # Coordinates are formatted with %a, which is repr() and so matches str() for ints and floats
+    def render(self, out, y, xmul, suffix = b'', label = b''):
+        cls = b'start_%s end_%s%s' % (self.sword.encode('utf-8'), self.eword.encode('utf-8'), suffix)
+        x = self.start * xmul
+        out.write(b'<rect x="%a" y="%a" width="%a" height="%a" class="%s"/><text x="%a" y="%a" class="%s">%s</text>' % (
+            x, y, (self.end - self.start) * xmul, self.HEIGHT, cls,
+            x, y + self.HEIGHT / 2.0, cls, label,
+        ))
 
 class Event(object):
     def __init__(self, desc = None, time = None, from_rg = None, with_rg = None, name = None):
@@ -340,56 +399,55 @@ class Event(object):
         self.from_rg = set() if from_rg is None else from_rg
         self.with_rg = set() if with_rg is None else with_rg
         self.classes = set()
+        self.class_bytes = None
         self.name = name
 
     @classmethod
     def from_tokens(cls, tok, hdr):
         inst = cls()
-        if len(hdr) > 1:
-            inst.name = ' '.join(hdr[1:])
+        if hdr:
+            inst.name = hdr
         for t in tok:
             if t is osp.INDENT:
                 print('Warning: unexpected event indent', file=sys.stderr)
             elif t is osp.DEDENT:
+                inst.classes, inst.class_bytes = pool_classes(inst.classes)
                 return inst
             else:
                 if not t:
                     continue
-                parts = t.split()
-                cmd = parts[0]
+                cmd, rest = split_directive(t)
                 if cmd == 'at':
-                    inst.time = float(parts[1])
+                    inst.time = parse_number(rest.split(None, 1)[0])
                 elif cmd == 'desc':
-                    inst.desc = ' '.join(parts[1:])
+                    inst.desc = ' '.join(rest.split())
                 elif cmd == 'from':
-                    for p in parts[1:]:
-                        inst.from_rg.add(p)
+                    inst.from_rg.update(rest.split())
                 elif cmd == 'with':
-                    for p in parts[1:]:
-                        inst.with_rg.add(p)
+                    inst.with_rg.update(rest.split())
                 elif cmd == 'class':
-                    for p in parts[1:]:
-                        inst.classes.add(p)
+                    inst.classes.update(rest.split())
                 else:
-                    print(f'Warning: unhandled event directive {parts}', file=sys.stderr)
+                    print(f'Warning: unhandled event directive {t!r}', file=sys.stderr)
         print('Warning: interpreting EOF as ending event block', file=sys.stderr)
+        inst.classes, inst.class_bytes = pool_classes(inst.classes)
         return inst
 
     def is_valid(self):
         return self.time is not None
 
     def link(self, tml):
+        ranges = tml.ranges
         for sname in ('from_rg', 'with_rg'):
             sval = getattr(self, sname)
-            nval = set(
-                tml.ranges[nm] for nm in sval if nm in tml.ranges
-            )
-            diff = sval - set(rg.name for rg in nval)
-            if diff:
-                print(f'Warning: link for {sname} failed on ranges with keys: {diff}', file=sys.stderr)
+            nval = {rg for rg in map(ranges.get, sval) if rg is not None}
+            if __debug__:
+                diff = sval - {rg.name for rg in nval}
+                if diff:
+                    print(f'Warning: link for {sname} failed on ranges with keys: {diff}', file=sys.stderr)
             setattr(self, sname, nval)
         if self.with_rg:
-            last = sorted(self.with_rg, key = lambda rg: rg.idx)[-1]
+            last = max(self.with_rg, key = lambda rg: rg.idx)
             last.hanging_events.append(self)
 
     def layout(self, tml, rg):
@@ -411,20 +469,14 @@ class Event(object):
     BOX_HEIGHT = 70
     TEXT_HEIGHT = 20
 
-    def render(self, svg, xmul, tml):
-        ln = ET.SubElement(svg, 'line')
-        ln.set('class', 'event ' + ' '.join(self.classes))
-        lb = ET.SubElement(svg, 'text')
-        lb.text = self.desc
-        lb.set('class', 'event ' + ' '.join(self.classes))
-        x = str(self.time * xmul)
-        ln.set('x1', x)
-        ln.set('x2', x)
-        lb.set('x', x)
+    def render(self, out, xmul, tml):
+        if self.class_bytes is None:
+            self.classes, self.class_bytes = pool_classes(self.classes)
+        cls = b'event ' + self.class_bytes
+        x = self.time * xmul
         if self.is_universal():
-            ln.set('y1', '0')
-            ln.set('y2', str(self.y))
-            lb.set('y', str(self.y + self.TEXT_HEIGHT))
+            yl = 0
+            yh = self.y
         else:
             yn = {self.y}
             yx = {self.y}
@@ -433,9 +485,10 @@ class Event(object):
                 yx.add(rg.y + Span.HEIGHT)
             yl = min(yn)
             yh = max(yx)
-            ln.set('y1', str(yl))
-            ln.set('y2', str(yh))
-            lb.set('y', str(yh + self.TEXT_HEIGHT))
+        out.write(b'<line class="%s" x1="%a" x2="%a" y1="%a" y2="%a"/><text class="%s" x="%a" y="%a">%s</text>' % (
+            cls, x, x, yl, yh,
+            cls, x, yh + self.TEXT_HEIGHT, html.escape(self.desc or '').encode('utf-8'),
+        ))
 
 
 class Character(Range):
@@ -448,29 +501,27 @@ class Character(Range):
     END_WORDS = Range.END_WORDS | {'died', 'living'}
 
     @classmethod
-    def unhandled_directive(cls, inst, parts):
-        cmd = parts[0]
+    def unhandled_directive(cls, inst, cmd, rest):
         if cmd == 'gender':
-            inst.gender = parts[1]
+            inst.gender = rest.split(None, 1)[0]
         elif cmd == 'parent':
-            for p in parts[1:]:
-                inst.parents.add(p)
+            inst.parents.update(rest.split())
 
     def link(self, tml):
         super().link(tml)
+        ranges = tml.ranges
         old_par = self.parents
-        self.parents = set(
-            tml.ranges[nm] for nm in self.parents if nm in tml.ranges
-        )
-        diff = old_par - set(rg.name for rg in self.parents)
-        if diff:
-            print(f'Warning: link for parents for {self.name} failed on ranges with keys: {diff}', file=sys.stderr)
+        self.parents = {rg for rg in map(ranges.get, old_par) if rg is not None}
+        if __debug__:
+            diff = old_par - {rg.name for rg in self.parents}
+            if diff:
+                print(f'Warning: link for parents for {self.name} failed on ranges with keys: {diff}', file=sys.stderr)
 
     def additional_repr(self):
         return f' parents {self.parents} gender {self.gender}'
 
-    def render(self, svg, xmul, tml):
-        super().render(svg, xmul, tml)
+    def render(self, out, xmul, tml):
+        super().render(out, xmul, tml)
         if not (self.spans and self.parents):
             return
         x = self.spans[0].start * xmul
@@ -481,8 +532,7 @@ class Character(Range):
             yn.add(par.y)
             yx.add(par.y + Span.HEIGHT)
         yl, yh = min(yn), max(yx)
-        ln = ET.SubElement(svg, 'line', x1 = str(x), x2 = str(x), y1 = str(yl), y2 = str(yh))
-        ln.set('class', 'child')
+        out.write(b'<line x1="%a" x2="%a" y1="%a" y2="%a" class="child"/>' % (x, x, yl, yh))
 
 
 class Constraint(object):
@@ -499,8 +549,8 @@ class Constraint(object):
     @classmethod
     def from_tokens(cls, tok, hdr):
         inst = cls()
-        if len(hdr) > 1:
-            inst.name = ' '.join(hdr[1:])
+        if hdr:
+            inst.name = hdr
         for t in tok:
             if t is osp.INDENT:
                 print('Warning: unexpected constraint indent', file=sys.stderr)
@@ -509,38 +559,46 @@ class Constraint(object):
             else:
                 if not t:
                     continue
-                parts = t.split()
-                cmd = parts[0]
+                cmd, rest = split_directive(t)
                 if cmd == 'before':
-                    inst.before = parts[1:]
+                    inst.before = rest.split()
                 elif cmd == 'after':
-                    inst.after = parts[1:]
+                    inst.after = rest.split()
                 elif cmd == 'offset':
-                    inst.offset = float(parts[1])
+                    inst.offset = parse_number(rest.split(None, 1)[0])
                 elif cmd == 'strict':
                     inst.strict = True
                 else:
-                    print(f'Warning: unhandled constraint directive {parts}', file=sys.stderr)
+                    print(f'Warning: unhandled constraint directive {t!r}', file=sys.stderr)
         print('Warning: interpreting EOF as ending constraint block', file=sys.stderr)
         return inst
 
     @classmethod
     def select(cls, sel, tml):
-        grp = tml.groups.get(sel[0])
-        if grp is not None:
-            return grp.into_result(tml)
-        rg = tml.ranges.get(sel[0])
-        if rg is not None:
+        key = tuple(sel)
+        if key not in tml.selections:
+            tml.selections[key] = cls.lookup(sel, tml)
+        return tml.selections[key]
+
+    @classmethod
+    def lookup(cls, sel, tml):
+        if tml.symbols is None:
+            tml.build_symbols()
+        sym = tml.symbols.get(sel[0])
+        if sym is None:
+            return None
+        kind, obj = sym
+        if kind == SYM_GROUP:
+            return obj.into_result(tml)
+        if kind == SYM_RANGE:
             idx = 0
             prop = 'start'
             if len(sel) > 1:
                 prop = sel[-1]
             if len(sel) > 2:
                 idx = int(sel[1])
-            return GroupResult(sel[0], {getattr(rg.spans[idx], prop)})
-        for ev in tml.events:
-            if ev.name == sel[0]:
-                return GroupResult(sel[0], {ev.time})
+            return GroupResult(sel[0], {getattr(obj.spans[idx], prop)})
+        return GroupResult(sel[0], {obj.time})
 
     def verify(self, tml):
         bft = self.select(self.before, tml)
@@ -574,8 +632,8 @@ class Group(object):
     @classmethod
     def from_tokens(cls, tok, hdr):
         inst = cls()
-        if len(hdr) > 1:
-            inst.name = ' '.join(hdr[1:])
+        if hdr:
+            inst.name = hdr
         for t in tok:
             if t is osp.INDENT:
                 print('Warning: unexpected group indent', file=sys.stderr)
@@ -584,12 +642,11 @@ class Group(object):
             else:
                 if not t:
                     continue
-                parts = t.split()
-                cmd = parts[0]
+                cmd, rest = split_directive(t)
                 if cmd == 'event':
-                    inst.evs.add(tuple(parts[1:]))
+                    inst.evs.add(tuple(rest.split()))
                 else:
-                    print(f'Warning: unhandled group directive {parts}', file=sys.stderr)
+                    print(f'Warning: unhandled group directive {t!r}', file=sys.stderr)
         print('Warning: interpreting EOF as ending group block')
         return inst
 
@@ -624,32 +681,24 @@ class GroupResult(object):
 class Sequence(object):
     @classmethod
     def from_tokens(cls, tok, hdr):
-        cons = []
-        nm = None
-        idx = 0
-        if len(hdr) > 1:
-            nm = ' '.join(hdr[1:])
-        lastev = None
+        nm = hdr or None
+        evs = []
         for t in tok:
             if t is osp.INDENT:
                 print('Warning: unexpected sequence indent', file=sys.stderr)
             elif t is osp.DEDENT:
-                return cons
+                break
             else:
                 if not t:
                     continue
-                parts = t.split()
-                cmd = parts[0]
+                cmd, rest = split_directive(t)
                 if cmd == 'event':
-                    ev = parts[1:]
-                    if lastev is not None:
-                        cons.append(Constraint(f'{nm}_{idx}', lastev, ev))
-                        idx += 1
-                    lastev = ev
+                    evs.append(rest.split())
                 else:
-                    print(f'Warning: unhandled sequence directive {parts}', file=sys.stderr)
-        print('Warning: interpreting EOF as ending sequence block')
-        return cons
+                    print(f'Warning: unhandled sequence directive {t!r}', file=sys.stderr)
+        else:
+            print('Warning: interpreting EOF as ending sequence block')
+        return [Constraint(f'{nm}_{idx}', evs[idx], evs[idx + 1]) for idx in range(len(evs) - 1)]
 
 
 if __name__ == '__main__':